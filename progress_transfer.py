@@ -0,0 +1,331 @@
+"""
+Bulk export/import of the `progress` and `users` tables (CSV or Parquet).
+
+Examples:
+    python progress_transfer.py export progress.csv
+    python progress_transfer.py export users.parquet --table users
+    python progress_transfer.py import progress.parquet --db other_progress.db
+
+Rows are streamed in chunks in both directions, so memory use stays flat
+regardless of table size. Imports upsert on the table's primary key
+((user_id, date_str) for progress, username for users), the same way the
+app writes progress; importing users therefore overwrites the password_hash
+of any user already in the target database. Empty/NULL lesson and quiz
+values are stored as 0.
+
+Imports commit every --commit-every rows, so a run that fails part-way
+(e.g. on a bad row) leaves the earlier batches committed. Fix the input and
+re-run: the upsert makes repeating an import safe.
+
+Parquet support needs `pyarrow` (pip install pyarrow).
+"""
+import argparse
+import csv
+import itertools
+import os
+import pathlib
+import sqlite3
+import sys
+import time
+
+# --- 1. CONFIGURATION ---
+
+DB_NAME = 'german_progress.db' # Same SQLite file as streamlit_app.py
+
+DEFAULT_CHUNK_SIZE = 10_000      # Rows per fetchmany / executemany call
+DEFAULT_COMMIT_EVERY = 500_000   # Rows per import transaction
+
+# Column order, key and schema per table (mirrors init_db() in streamlit_app.py)
+TABLES = {
+    'progress': {
+        'columns': ['user_id', 'date_str', 'lesson', 'quiz'],
+        'int_columns': ['lesson', 'quiz'],
+        'key': ['user_id', 'date_str'],
+        'schema': """
+            CREATE TABLE IF NOT EXISTS progress (
+                user_id TEXT NOT NULL,
+                date_str TEXT NOT NULL,
+                lesson INTEGER DEFAULT 0,
+                quiz INTEGER DEFAULT 0,
+                PRIMARY KEY (user_id, date_str)
+            )
+        """,
+    },
+    'users': {
+        'columns': ['username', 'password_hash'],
+        'int_columns': [],
+        'key': ['username'],
+        'schema': """
+            CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY,
+                password_hash TEXT NOT NULL
+            )
+        """,
+    },
+}
+
+FORMATS = ('csv', 'parquet')
+
+
+# --- 2. HELPERS ---
+
+def detect_format(path, fmt=None):
+    """Returns the file format, taken from --format or the file extension."""
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    if ext == 'pq':
+        ext = 'parquet'
+    if ext not in FORMATS:
+        raise SystemExit(f"Cannot infer format from '{path}'; pass --format csv|parquet.")
+    return ext
+
+def load_pyarrow():
+    """Imports pyarrow lazily so CSV transfers work without it."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet support requires pyarrow: pip install pyarrow")
+    return pa, pq
+
+def arrow_schema(pa, table):
+    """Builds the Arrow schema for a table (TEXT -> string, INTEGER -> int64)."""
+    spec = TABLES[table]
+    return pa.schema([
+        (col, pa.int64() if col in spec['int_columns'] else pa.string())
+        for col in spec['columns']
+    ])
+
+def report(action, table, rows, started):
+    """Prints row count and throughput for a finished transfer."""
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else float('inf')
+    print(f"{action} {rows:,} {table} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)",
+          file=sys.stderr)
+
+
+# --- 3. EXPORT ---
+
+def open_source_db(db_path, table):
+    """Opens an existing database read-only and checks that the table exists."""
+    if not os.path.isfile(db_path):
+        raise SystemExit(f"Database '{db_path}' does not exist.")
+    conn = sqlite3.connect(f"{pathlib.Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,))
+    if cursor.fetchone() is None:
+        conn.close()
+        raise SystemExit(f"Database '{db_path}' has no '{table}' table.")
+    return conn
+
+def iter_db_chunks(conn, table, chunk_size):
+    """Yields lists of row tuples from a table using fetchmany."""
+    columns = ', '.join(TABLES[table]['columns'])
+    key = ', '.join(TABLES[table]['key'])
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {columns} FROM {table} ORDER BY {key}")
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+def write_csv(path, table, chunks):
+    """Writes row chunks to a CSV file with a header row."""
+    rows_written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(TABLES[table]['columns'])
+        for rows in chunks:
+            writer.writerows(rows)
+            rows_written += len(rows)
+    return rows_written
+
+def write_parquet(path, table, chunks):
+    """Writes row chunks to a Parquet file, one row group per chunk."""
+    pa, pq = load_pyarrow()
+    schema = arrow_schema(pa, table)
+    columns = TABLES[table]['columns']
+    rows_written = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            arrays = [pa.array(values, type=schema.field(col).type)
+                      for col, values in zip(columns, zip(*rows))]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows_written += len(rows)
+    return rows_written
+
+def export_table(db_path, table, path, fmt, chunk_size):
+    """Streams a table from SQLite into a CSV/Parquet file. Returns the row count."""
+    if fmt == 'parquet':
+        load_pyarrow()
+    conn = open_source_db(db_path, table)
+    # Write next to the target and swap it in only once the export succeeded,
+    # so a failed run never clobbers an existing file.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        chunks = iter_db_chunks(conn, table, chunk_size)
+        if fmt == 'parquet':
+            rows_written = write_parquet(tmp_path, table, chunks)
+        else:
+            rows_written = write_csv(tmp_path, table, chunks)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        conn.close()
+    return rows_written
+
+
+# --- 4. IMPORT ---
+
+def to_int(value, path, location, col):
+    """Converts an integer cell; an empty CSV cell or Parquet NULL becomes 0 (column DEFAULT 0)."""
+    if value is None or value == '':
+        return 0
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise SystemExit(f"{path}, {location}: invalid integer {value!r} in column '{col}'")
+
+def check_input(path, table, fmt):
+    """Checks that the input file exists and has the table's columns."""
+    if not os.path.isfile(path):
+        raise SystemExit(f"Input file '{path}' does not exist.")
+    if fmt == 'parquet':
+        pa, pq = load_pyarrow()
+        try:
+            names = pq.read_schema(path).names
+        except pa.ArrowException as e:
+            raise SystemExit(f"{path} is not a readable Parquet file: {e}")
+    else:
+        with open(path, newline='', encoding='utf-8') as f:
+            names = next(csv.reader(f), [])
+    missing = set(TABLES[table]['columns']) - set(names)
+    if missing:
+        raise SystemExit(f"{path} is missing column(s): {', '.join(sorted(missing))}")
+
+def read_csv_chunks(path, table, chunk_size):
+    """Yields lists of row tuples from a CSV file, in table column order."""
+    spec = TABLES[table]
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        int_columns = set(spec['int_columns'])
+        n_fields = len(reader.fieldnames)
+
+        def parse_rows():
+            for rec in reader:
+                # DictReader pads short rows with None and collects extra fields
+                # under the None key; either means a damaged line, not empty cells.
+                if None in rec or None in rec.values():
+                    raise SystemExit(f"{path}, line {reader.line_num}: expected {n_fields} fields")
+                yield tuple(to_int(rec[col], path, f"line {reader.line_num}", col)
+                            if col in int_columns else rec[col]
+                            for col in spec['columns'])
+
+        rows = parse_rows()
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            yield chunk
+
+def read_parquet_chunks(path, table, chunk_size):
+    """Yields lists of row tuples from a Parquet file, batch by batch."""
+    _, pq = load_pyarrow()
+    spec = TABLES[table]
+    columns = spec['columns']
+    parquet_file = pq.ParquetFile(path)
+    offset = 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        values = []
+        for col in columns:
+            column = batch.column(col).to_pylist()
+            if col in spec['int_columns']:
+                column = [to_int(v, path, f"row {offset + i + 1}", col)
+                          for i, v in enumerate(column)]
+            values.append(column)
+        offset += batch.num_rows
+        yield list(zip(*values))
+
+def import_table(db_path, table, path, fmt, chunk_size, commit_every):
+    """Upserts rows from a CSV/Parquet file into SQLite. Returns the row count."""
+    spec = TABLES[table]
+    columns = ', '.join(spec['columns'])
+    placeholders = ', '.join('?' for _ in spec['columns'])
+    # Same upsert the app uses: the primary key decides which row is replaced.
+    sql = f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})"
+
+    # Validate the input before touching (or creating) the target database.
+    check_input(path, table, fmt)
+    if fmt == 'parquet':
+        chunks = read_parquet_chunks(path, table, chunk_size)
+    else:
+        chunks = read_csv_chunks(path, table, chunk_size)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(spec['schema'])
+        conn.commit()
+        cursor = conn.cursor()
+        rows_loaded = 0
+        pending = 0
+        # sqlite3 opens a transaction implicitly on the first INSERT; each
+        # commit closes it, so one transaction spans up to commit_every rows.
+        for rows in chunks:
+            try:
+                cursor.executemany(sql, rows)
+            except sqlite3.IntegrityError as e:
+                raise SystemExit(f"{path}: rejected row near row {rows_loaded + 1:,}: {e}")
+            rows_loaded += len(rows)
+            pending += len(rows)
+            if pending >= commit_every:
+                conn.commit()
+                pending = 0
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return rows_loaded
+
+
+# --- 5. CLI ---
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bulk export/import of progress and users tables (CSV or Parquet)."
+    )
+    parser.add_argument('action', choices=['export', 'import'])
+    parser.add_argument('path', help="CSV or Parquet file to write (export) or read (import)")
+    parser.add_argument('--db', default=DB_NAME, help=f"SQLite database (default: {DB_NAME})")
+    parser.add_argument('--table', choices=sorted(TABLES), default='progress')
+    parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Rows per fetchmany/executemany batch (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--commit-every', type=int, default=DEFAULT_COMMIT_EVERY,
+                        help=f"Rows per import transaction (default: {DEFAULT_COMMIT_EVERY})")
+    args = parser.parse_args(argv)
+    if args.chunk_size <= 0 or args.commit_every <= 0:
+        parser.error("--chunk-size and --commit-every must be positive")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    fmt = detect_format(args.path, args.format)
+    started = time.perf_counter()
+    if args.action == 'export':
+        rows = export_table(args.db, args.table, args.path, fmt, args.chunk_size)
+        report("Exported", args.table, rows, started)
+    else:
+        rows = import_table(args.db, args.table, args.path, fmt,
+                            args.chunk_size, args.commit_every)
+        report("Imported", args.table, rows, started)
+
+
+if __name__ == "__main__":
+    main()